@@ -1,10 +1,11 @@
 #!/usr/bin/env python
 
 from os import environ
-from sys import argv
+from sys import argv, stdout
 
-if "username" in argv[1].lower():
-    print(environ["GIT_USERNAME"])
-
-if "password" in argv[1].lower():
-    print(environ["GIT_PASSWORD"])
+# git asks "Username for '<url>': " or "Password for '<url>': "
+prompt = argv[1][:1].lower()
+if prompt == "u":
+    stdout.write(environ["GIT_USERNAME"] + "\n")
+elif prompt == "p":
+    stdout.write(environ["GIT_PASSWORD"] + "\n")
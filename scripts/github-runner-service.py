@@ -3,7 +3,7 @@
 import argparse
 import logging
 import os
-import re
+import pathlib
 import subprocess
 import sys
 
@@ -13,19 +13,20 @@ EXECUTABLE = "./bin/runsvc.sh"
 
 def get_pid(runner):
     pid_file = os.path.join(TOP_DIR, runner, ".service.pid")
-    pid = None
-    if os.path.exists(pid_file):
-        pid = open(pid_file).read().strip()
+    try:
+        pid = pathlib.Path(pid_file).read_text().strip()
         logging.debug(f"read pid file. pid={pid}")
+    except FileNotFoundError:
+        pid = None
 
     if pid is not None:
-        a = subprocess.run(["ps", "-A"], capture_output=True, check=False)
-        ps = [
-            line
-            for line in a.stdout.decode().split("\n")
-            if re.match(f"{pid}\\s", line)
-        ]
-        if not ps:
+        # signal 0 does not kill, it only checks whether the process exists
+        try:
+            os.kill(int(pid), 0)
+        except PermissionError:
+            # the process exists but belongs to another user
+            pass
+        except (ProcessLookupError, ValueError):
             logging.debug(f"process {pid} (runner={runner}) is not running. Resetting.")
             pid = None
     return pid
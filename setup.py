@@ -66,8 +66,8 @@ setup(
     ),
     url="http://cxc.harvard.edu/mta/ASPECT/tool_doc/pydocs/skare3_tools.html",
     entry_points=entry_points,
+    # setuptools_scm is configured in pyproject.toml
     use_scm_version=True,
-    setup_requires=["setuptools_scm", "setuptools_scm_git_archive"],
     zip_safe=False,
     tests_require=["pytest"],
     cmdclass=cmdclass,
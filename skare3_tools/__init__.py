@@ -1,17 +1,24 @@
-import warnings
-
-from pkg_resources import DistributionNotFound, get_distribution
-from setuptools_scm import get_version
-
 try:
+    # written by setuptools_scm when the package is built
+    from ._version import version as __version__
+except ImportError:
     try:
-        _dist_info = get_distribution(__name__)
-        __version__ = _dist_info.version
-        # the following fails with a local repo with an egg in it
-        assert __file__.lower().startswith(_dist_info.location.lower())
-    except (DistributionNotFound, AssertionError):
-        # this might be a local git repo
-        __version__ = get_version(root="..", relative_to=__file__)
-except Exception:
-    warnings.warn("Failed to find skare3_tools package version, setting to 0.0.0")
-    __version__ = "0.0.0"
+        from importlib.metadata import PackageNotFoundError, distribution
+
+        try:
+            _dist_info = distribution(__name__)
+            # the installed distribution is not this one when importing from a local git repo
+            # while another skare3_tools is installed
+            if not __file__.lower().startswith(str(_dist_info.locate_file("")).lower()):
+                raise PackageNotFoundError(__name__)
+            __version__ = _dist_info.version
+        except PackageNotFoundError:
+            # this might be a local git repo
+            from setuptools_scm import get_version
+
+            __version__ = get_version(root="..", relative_to=__file__)
+    except Exception:
+        import warnings
+
+        warnings.warn("Failed to find skare3_tools package version, setting to 0.0.0")
+        __version__ = "0.0.0"
@@ -1,58 +1,102 @@
 import argparse
-import json
+import functools
 import logging
 import os
 import re
 import shutil
 import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 logger = logging.getLogger("skare3_tools.conda")
 
 
+@functools.lru_cache(maxsize=4)
+def _conda_list(prefix, no_pip=True):
+    """
+    Parsed output of `conda list --json` for the environment at `prefix` (cached).
+    """
+    cmd = ["conda", "list", "--prefix", prefix, "--json"]
+    if no_pip:
+        cmd.append("--no-pip")
+    return json_loads(subprocess.check_output(cmd))
+
+
+# --reflink is a GNU cp option, so it is only tried on linux, and not again after it fails once
+_USE_REFLINK = sys.platform.startswith("linux")
+
+
+def _copy(src, directory):
+    """
+    Copy file `src` into `directory`.
+
+    On copy-on-write filesystems (btrfs, XFS) `cp --reflink=auto` shares the data blocks instead of
+    copying them. If cp is not available or does not support --reflink, use shutil.copy.
+    """
+    global _USE_REFLINK  # noqa: PLW0603
+    if _USE_REFLINK:
+        try:
+            subprocess.check_call(
+                ["cp", "--reflink=auto", str(src), str(directory)],
+                stderr=subprocess.DEVNULL,
+            )
+            return
+        except (FileNotFoundError, subprocess.CalledProcessError):
+            _USE_REFLINK = False
+    shutil.copy(src, directory)
+
+
 def gather_env_pkgs(
     directory, pkgs_dir=None, include_channels=None, exclude_channels=()
 ):
     directory = Path(directory)
     if pkgs_dir is None:
-        parts = []
-        for part in Path(os.environ["CONDA_PREFIX"]).parts:
-            if part == "envs":
-                parts.append("pkgs")
-                break
-            else:
-                parts.append(part)
-        pkgs_dir = Path(*parts)
-    all_pkgs = json.loads(
-        subprocess.check_output(["conda", "list", "--no-pip", "--json"]).decode()
-    )
+        # <root>/envs/<name> -> <root>/pkgs, and <root> -> <root>/pkgs for the base environment
+        prefix = os.environ["CONDA_PREFIX"]
+        root, sep, _ = prefix.partition(f"{os.sep}envs{os.sep}")
+        pkgs_dir = Path(root if sep else prefix) / "pkgs"
+    all_pkgs = _conda_list(os.environ["CONDA_PREFIX"])
+    exclude_channels = [re.compile(c) for c in exclude_channels]
+    include_channels = set(include_channels) if include_channels else None
     pkgs = []
     for p in all_pkgs:
-        match = []
-        if exclude_channels:
-            match = [re.search(c, p["channel"]) for c in exclude_channels]
-            match = [
-                bool(m) and m.span()[0] == 0 and m.span()[1] == len(p["channel"])
-                for m in match
-            ]
-            if sum(match):
-                continue
-        if include_channels and ["channel"] not in include_channels:
+        if any(c.fullmatch(p["channel"]) for c in exclude_channels):
+            continue
+        if include_channels is not None and p["channel"] not in include_channels:
             continue
         pkgs.append(p)
 
     if pkgs and not directory.exists():
         directory.mkdir(parents=True)
+    pkgs_dir = Path(pkgs_dir)
+    # list pkgs_dir once instead of checking for each package file.
+    # A missing pkgs_dir just means that every package is ignored.
+    available = set()
+    if pkgs:
+        try:
+            with os.scandir(pkgs_dir) as entries:
+                available = {entry.name for entry in entries}
+        except FileNotFoundError:
+            pass
+    sources = []
     for pkg in pkgs:
-        name = ""
-        if (pkgs_dir / f'{pkg["dist_name"]}.conda').exists():
-            name = pkgs_dir / f'{pkg["dist_name"]}.conda'
-        elif (pkgs_dir / f'{pkg["dist_name"]}.tar.bz2').exists():
-            name = pkgs_dir / f'{pkg["dist_name"]}.tar.bz2'
-        if name:
-            shutil.copy(name, directory)
+        conda_name = f'{pkg["dist_name"]}.conda'
+        tar_name = f'{pkg["dist_name"]}.tar.bz2'
+        if conda_name in available:
+            sources.append(pkgs_dir / conda_name)
+        elif tar_name in available:
+            sources.append(pkgs_dir / tar_name)
         else:
             logger.debug(f'ignored {pkg["dist_name"]}')
+    # copying is I/O-bound, so the copies can overlap
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(lambda src: _copy(src, directory), sources))
 
 
 def get_parser():
@@ -3,7 +3,7 @@ Skare3-tools configuration.
 
 The configuration is automatically set with default values which specify the location of the skare3
 repository, the different conda channels used, the Github organizations who own the packages, and
-the directory where to store cached data. This happens the first time this module is imported.
+the directory where to store cached data. This happens the first time ``CONFIG`` is accessed.
 
 Normally, a user does not need to do anything except to add an environment variable with the
 standard password to conda channels called CONDA_PASSWORD.
@@ -142,6 +142,11 @@ def init(config=None, reset=False):
     :return:
     """
     global CONFIG  # noqa: PLW0603
+    # the global CONFIG is only bound once loading succeeds, so a failed first load is not hidden
+    # by a half-initialized CONFIG, and every access keeps raising until it can be loaded
+    new_config = (
+        globals()["CONFIG"] if "CONFIG" in globals() else _DEFAULT_CONFIG.copy()
+    )
     app_data_dir = _app_data_dir_()
     if app_data_dir is None:
         raise Exception(
@@ -153,22 +158,29 @@ def init(config=None, reset=False):
     exists = os.path.exists(config_file)
     if exists and not reset:
         with open(config_file) as f:
-            CONFIG = json.load(f)
+            new_config = json.load(f)
 
     if config is not None:
-        CONFIG.update(config)
+        new_config.update(config)
     if config or reset or not exists:
         if reset:
-            CONFIG = _DEFAULT_CONFIG.copy()
-        if "data_dir" not in CONFIG or not CONFIG["data_dir"]:
-            CONFIG["data_dir"] = os.path.join(app_data_dir, "data")
-        if not os.path.exists(CONFIG["data_dir"]):
-            os.makedirs(CONFIG["data_dir"])
+            new_config = _DEFAULT_CONFIG.copy()
+        if "data_dir" not in new_config or not new_config["data_dir"]:
+            new_config["data_dir"] = os.path.join(app_data_dir, "data")
+        if not os.path.exists(new_config["data_dir"]):
+            os.makedirs(new_config["data_dir"])
         with open(config_file, "w") as f:
-            json.dump(CONFIG, f, indent=2)
+            json.dump(new_config, f, indent=2)
+    CONFIG = new_config
 
 
-# this could be replaced by a lazy attribute in shiny
+# CONFIG is set the first time it is accessed, by the module __getattr__ below
 # (https://www.python.org/dev/peps/pep-0562/)
-CONFIG = _DEFAULT_CONFIG.copy()
-init()
+CONFIG: dict
+
+
+def __getattr__(name):
+    if name == "CONFIG":
+        init()
+        return CONFIG
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
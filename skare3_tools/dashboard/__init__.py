@@ -4,13 +4,36 @@ Tools to display package information on web pages.
 Most implementation is in the :mod:`~skare3_tools.dashboard.views` submodule.
 """
 
-from jinja2 import Environment, PackageLoader, select_autoescape
+_env = None
 
-env = Environment(
-    loader=PackageLoader("skare3_tools.dashboard", "templates"),
-    autoescape=select_autoescape(["html", "xml"]),
-)
+
+def _get_env():
+    # the jinja2 environment is created (and jinja2 imported) the first time it is needed
+    global _env  # noqa: PLW0603
+    if _env is None:
+        from jinja2 import (
+            Environment,
+            FileSystemBytecodeCache,
+            PackageLoader,
+            select_autoescape,
+        )
+
+        # compiled templates are cached on disk (in a per-user temporary directory),
+        # so short-lived scripts do not compile them every time
+        _env = Environment(
+            loader=PackageLoader("skare3_tools.dashboard", "templates"),
+            autoescape=select_autoescape(["html", "xml"]),
+            bytecode_cache=FileSystemBytecodeCache(),
+            auto_reload=False,
+        )
+    return _env
 
 
 def get_template(*args, **kwargs):
-    return env.get_template(*args, **kwargs)
+    return _get_env().get_template(*args, **kwargs)
+
+
+def __getattr__(name):
+    if name == "env":
+        return _get_env()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
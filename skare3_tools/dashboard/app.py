@@ -1,30 +1,35 @@
 from flask import Flask
 
-from skare3_tools.dashboard.views.dashboard import dashboard
-from skare3_tools.dashboard.views.test_log import test_log
-from skare3_tools.dashboard.views.test_results import test_results
-from skare3_tools.dashboard.views.test_stream import test_stream
+# views are imported in each route, so they are only loaded when first requested
 
 app = Flask(__name__)
 
 
 @app.route("/")
 def main():
+    from skare3_tools.dashboard.views.dashboard import dashboard
+
     return dashboard()
 
 
 @app.route("/tests/logs/<path:text>")
 def tests_logs(text):
+    from skare3_tools.dashboard.views.test_log import test_log
+
     return test_log(text)
 
 
 @app.route("/tests")
 def tests():
+    from skare3_tools.dashboard.views.test_results import test_results
+
     return test_results()
 
 
 @app.route("/tests/stream")
 def tests_stream():
+    from skare3_tools.dashboard.views.test_stream import test_stream
+
     return test_stream()
 
 
@@ -1,8 +1,9 @@
 #!/usr/bin/env python
 
 import argparse
-import datetime
 import json
+import operator
+from collections import defaultdict
 from pathlib import Path
 
 from skare3_tools import packages
@@ -10,54 +11,61 @@ from skare3_tools import test_results as tr
 from skare3_tools.dashboard import get_template
 
 package_name_map = packages.get_package_list()
+_REPO2NAME = {p["repository"]: p["name"] for p in package_name_map}
+_EXCLUDE = frozenset(["skare"])
 
 
-def dashboard(config=None, render=True):
+def _page(info, config=None):
+    """
+    Return the dashboard template and the context to render it with.
+
+    Used both to render the page to a string and to stream it to a file.
+    """
     if config is None:
         config = {"static_dir": "static"}
+    return get_template("dashboard.html"), {
+        "title": "Skare3 Packages",
+        "info": info,
+        "config": config,
+    }
 
-    exclude = ["skare"]
 
+def dashboard(config=None, render=True):
     info = packages.get_repositories_info()
     test_results = tr.get_latest(stream="ska3-masters")
 
-    repo2name = {p["repository"]: p["name"] for p in package_name_map}
-
     info["packages"] = sorted(
-        [p for p in info["packages"] if p["name"] not in exclude],
-        key=lambda p: p["name"],
+        (p for p in info["packages"] if p["name"] not in _EXCLUDE),
+        key=operator.itemgetter("name"),
     )
+    tests_by_package = defaultdict(list)
+    for ts in test_results.get("test_suites", []):
+        tests_by_package[ts["package"]].append(ts)
+
     for p in info["packages"]:
         for pr in p["pull_requests"]:
-            if pr["last_commit_date"] is None:
-                pr["last_commit_date"] = ""
-            else:
-                pr["last_commit_date"] = (
-                    datetime.datetime.strptime(
-                        pr["last_commit_date"], "%Y-%m-%dT%H:%M:%SZ"
-                    )
-                    .date()
-                    .isoformat()
-                )
+            date = pr["last_commit_date"]
+            # dates are in ISO 8601 format (%Y-%m-%dT%H:%M:%SZ), so the date is the first 10 chars
+            pr["last_commit_date"] = "" if date is None else date[:10]
         p["test_version"] = ""
         p["test_status"] = ""
-        repo = "{owner}/{name}".format(**p)
-        if repo in repo2name:
-            package_tests = []
-            if "test_suites" in test_results:
-                package_tests = [
-                    ts
-                    for ts in test_results["test_suites"]
-                    if ts["package"] == repo2name[repo]
-                ]
+        repo = f"{p['owner']}/{p['name']}"
+        if repo in _REPO2NAME:
+            package_tests = tests_by_package.get(_REPO2NAME[repo], [])
             if len(package_tests):
-                status = [
-                    tc["status"] for ts in package_tests for tc in ts["test_cases"]
-                ]
                 p["test_version"] = package_tests[0]["properties"]["package_version"]
-                if len([s for s in status if s == "fail"]):
+                # any() and all() stop at the first test case that decides the status
+                if any(
+                    tc["status"] == "fail"
+                    for ts in package_tests
+                    for tc in ts["test_cases"]
+                ):
                     p["test_status"] = "FAIL"
-                elif len(status) == len([s for s in status if s == "skipped"]):
+                elif all(
+                    tc["status"] == "skipped"
+                    for ts in package_tests
+                    for tc in ts["test_cases"]
+                ):
                     p["test_status"] = "SKIP"
                 else:
                     p["test_status"] = "PASS"
@@ -65,8 +73,8 @@ def dashboard(config=None, render=True):
     if not render:
         return info
 
-    template = get_template("dashboard.html")
-    return template.render(title="Skare3 Packages", info=info, config=config)
+    template, context = _page(info, config)
+    return template.render(**context)
 
 
 def get_parser():
@@ -85,11 +93,14 @@ def get_parser():
 
 def main():
     args = get_parser().parse_args()
+    info = dashboard(render=False)
     with open(args.o, "w") as out:
         if args.o.suffix == ".json":
-            json.dump(dashboard(render=False), out)
+            json.dump(info, out)
         else:
-            out.write(dashboard())
+            # write the page as it is rendered, without building the whole string first
+            template, context = _page(info)
+            template.stream(**context).dump(out)
 
 
 if __name__ == "__main__":
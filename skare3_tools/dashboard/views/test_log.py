@@ -6,6 +6,49 @@ import re
 from skare3_tools import config, dashboard
 from skare3_tools import test_results as tr
 
+_SPAN = {
+    "\x1b[1m": '<span style="font-weight: bold;">',
+    "\x1b[4m": '<span style="text-decoration: underline">',
+    # '\x1b[7m': '<span>',  # reverse
+    "\x1b[30m": '<span style="color:black">',
+    "\x1b[31m": '<span style="color:red">',
+    "\x1b[32m": '<span style="color:green">',
+    "\x1b[33m": '<span style="color:yellow">',
+    "\x1b[34m": '<span style="color:blue">',
+    "\x1b[35m": '<span style="color:magenta">',
+    "\x1b[36m": '<span style="color:cyan">',
+    "\x1b[37m": '<span style="color:white">',
+    "\x1b[30;1m": '<span style="font-weight: bold; color:black">',
+    "\x1b[31;1m": '<span style="font-weight: bold; color:red">',
+    "\x1b[32;1m": '<span style="font-weight: bold; color:green">',
+    "\x1b[33;1m": '<span style="font-weight: bold; color:yellow">',
+    "\x1b[34;1m": '<span style="font-weight: bold; color:blue">',
+    "\x1b[35;1m": '<span style="font-weight: bold; color:magenta">',
+    "\x1b[36;1m": '<span style="font-weight: bold; color:cyan">',
+    "\x1b[37;1m": '<span style="font-weight: bold; color:white">',
+    "\x1b[40m": '<span style="background-color:black">',
+    "\x1b[41m": '<span style="background-color:red">',
+    "\x1b[42m": '<span style="background-color:green">',
+    "\x1b[43m": '<span style="background-color:yellow">',
+    "\x1b[44m": '<span style="background-color:blue">',
+    "\x1b[45m": '<span style="background-color:magenta">',
+    "\x1b[46m": '<span style="background-color:cyan">',
+    "\x1b[47m": '<span style="background-color:white">',
+    "\x1b[40;1m": '<span style="font-weight: bold; background-color:black">',
+    "\x1b[41;1m": '<span style="font-weight: bold; background-color:red">',
+    "\x1b[42;1m": '<span style="font-weight: bold; background-color:green">',
+    "\x1b[43;1m": '<span style="font-weight: bold; background-color:yellow">',
+    "\x1b[44;1m": '<span style="font-weight: bold; background-color:blue">',
+    "\x1b[45;1m": '<span style="font-weight: bold; background-color:magenta">',
+    "\x1b[46;1m": '<span style="font-weight: bold; background-color:cyan">',
+    "\x1b[47;1m": '<span style="font-weight: bold; background-color:white">',
+}
+
+_RESET = "\x1b[0m"
+
+# ANSI escape codes and new lines are replaced in a single pass
+_ANSI_RE = re.compile(r"\x1b\[[0-9;]+m|\n")
+
 
 def html(text):
     """
@@ -19,64 +62,23 @@ def html(text):
     :param text:
     :return:
     """
-    span = {
-        "\x1b[1m": '<span style="font-weight: bold;">',
-        "\x1b[4m": '<span style="text-decoration: underline">',
-        # '\x1b[7m': '<span>',  # reverse
-        "\x1b[30m": '<span style="color:black">',
-        "\x1b[31m": '<span style="color:red">',
-        "\x1b[32m": '<span style="color:green">',
-        "\x1b[33m": '<span style="color:yellow">',
-        "\x1b[34m": '<span style="color:blue">',
-        "\x1b[35m": '<span style="color:magenta">',
-        "\x1b[36m": '<span style="color:cyan">',
-        "\x1b[37m": '<span style="color:white">',
-        "\x1b[30;1m": '<span style="font-weight: bold; color:black">',
-        "\x1b[31;1m": '<span style="font-weight: bold; color:red">',
-        "\x1b[32;1m": '<span style="font-weight: bold; color:green">',
-        "\x1b[33;1m": '<span style="font-weight: bold; color:yellow">',
-        "\x1b[34;1m": '<span style="font-weight: bold; color:blue">',
-        "\x1b[35;1m": '<span style="font-weight: bold; color:magenta">',
-        "\x1b[36;1m": '<span style="font-weight: bold; color:cyan">',
-        "\x1b[37;1m": '<span style="font-weight: bold; color:white">',
-        "\x1b[40m": '<span style="background-color:black">',
-        "\x1b[41m": '<span style="background-color:red">',
-        "\x1b[42m": '<span style="background-color:green">',
-        "\x1b[43m": '<span style="background-color:yellow">',
-        "\x1b[44m": '<span style="background-color:blue">',
-        "\x1b[45m": '<span style="background-color:magenta">',
-        "\x1b[46m": '<span style="background-color:cyan">',
-        "\x1b[47m": '<span style="background-color:white">',
-        "\x1b[40;1m": '<span style="font-weight: bold; background-color:black">',
-        "\x1b[41;1m": '<span style="font-weight: bold; background-color:red">',
-        "\x1b[42;1m": '<span style="font-weight: bold; background-color:green">',
-        "\x1b[43;1m": '<span style="font-weight: bold; background-color:yellow">',
-        "\x1b[44;1m": '<span style="font-weight: bold; background-color:blue">',
-        "\x1b[45;1m": '<span style="font-weight: bold; background-color:magenta">',
-        "\x1b[46;1m": '<span style="font-weight: bold; background-color:cyan">',
-        "\x1b[47;1m": '<span style="font-weight: bold; background-color:white">',
-    }
-
-    text = text.replace("\n", "<br/>\n")
-
-    reset = "\x1b[0m"
-    result = ""
     depth = 0
-    i = 0
-    matches = list(re.finditer(r"\x1b\[[0-9;]+m", text))
-    for m in matches:
-        s, e = m.span()
-        c = text[s:e]
-        result += text[i:s]
-        if c == reset:
-            result += "</span>" * depth
+
+    def replace(match):
+        nonlocal depth
+        c = match.group()
+        if c == "\n":
+            return "<br/>\n"
+        if c == _RESET:
+            result = "</span>" * depth
             depth = 0
-        elif c in span:
+            return result
+        if c in _SPAN:
             depth += 1
-            result += span[c]
-        i = e
-    result += text[i:]
-    return result
+            return _SPAN[c]
+        return ""
+
+    return _ANSI_RE.sub(replace, text)
 
 
 def test_log(path):
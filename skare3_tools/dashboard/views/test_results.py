@@ -3,10 +3,12 @@
 import argparse
 import json
 import webbrowser
+from collections import Counter
 from pathlib import Path
 
 from skare3_tools import dashboard
 from skare3_tools import test_results as tr
+from skare3_tools.test_results import json_loads
 
 
 def test_results():
@@ -18,6 +20,19 @@ def test_results():
     return _get_results(test_run, config)
 
 
+def _page(tests, config):
+    """
+    Return the test results template and the context to render it with.
+
+    Used both to render the page to a string and to stream it to a file.
+    """
+    return dashboard.get_template("test-results.html"), {
+        "title": "Skare3 Tests",
+        "data": tests,
+        "config": config,
+    }
+
+
 def _get_results(tests, config, render=True):
     if "run_info" not in tests:
         tests["run_info"] = {
@@ -32,20 +47,18 @@ def _get_results(tests, config, render=True):
             ]
         }
     for ts in tests["test_suites"]:
-        n_skipped = 0
-        n_fail = 0
-        n_pass = 0
+        if "log" in ts:
+            ts_log = ts["log"]
+            for tc in ts["test_cases"]:
+                if not tc.get("log"):
+                    tc["log"] = ts_log
         for tc in ts["test_cases"]:
-            if ("log" not in tc or not tc["log"]) and "log" in ts:
-                tc["log"] = ts["log"]
-            if tc["status"] == "pass":
-                n_pass += 1
-            elif tc["status"] == "fail":
-                n_fail += 1
-            elif tc["status"] == "skipped":
-                n_skipped += 1
             if "err_message" in tc:
                 tc["message"] = tc["err_message"]
+        counts = Counter(tc["status"] for tc in ts["test_cases"])
+        n_skipped = counts["skipped"]
+        n_fail = counts["fail"]
+        n_pass = counts["pass"]
         if n_fail > 0:
             ts["status"] = "fail"
         elif n_pass == 0 and n_skipped > 0:
@@ -59,8 +72,8 @@ def _get_results(tests, config, render=True):
     if not render:
         return tests
 
-    template = dashboard.get_template("test-results.html")
-    return template.render(title="Skare3 Tests", data=tests, config=config)
+    template, context = _page(tests, config)
+    return template.render(**context)
 
 
 def get_parser():
@@ -118,17 +131,20 @@ def main():
     if not args.file_in:
         results = tr.get()[-1]
     else:
-        with open(args.file_in, "r") as f:
-            results = json.load(f)
+        with open(args.file_in, "rb") as f:
+            results = json_loads(f.read())
         for key in ["architecture", "hostname", "system", "platform"]:
             if isinstance(results["run_info"][key], list):
                 results["run_info"][key] = ", ".join(results["run_info"][key])
 
+    results = _get_results(results, config, render=False)
     with open(args.file_out, "w") as out:
         if args.file_out.suffix == ".json":
-            json.dump(_get_results(results, config, render=False), out)
+            json.dump(results, out)
         else:
-            out.write(_get_results(results, config))
+            # write the page as it is rendered, without building the whole string first
+            template, context = _page(results, config)
+            template.stream(**context).dump(out)
 
     if not args.b and args.file_out.suffix in [".html", ".htm"]:
         file_out = args.file_out.absolute()
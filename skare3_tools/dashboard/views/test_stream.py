@@ -2,49 +2,48 @@ from skare3_tools import test_results as tr
 from skare3_tools.dashboard import get_template
 
 
+def _test_case_rows(column_names, run_cases):
+    """
+    Yield one row per test case, with its name and its status in each run.
+
+    Rows are generated while the template is rendered, so all of them are never held in memory.
+
+    :param column_names: list of str.
+    :param run_cases: list of dict. The test cases of the suite in each run.
+    """
+    for tc_name in sorted(set().union(*run_cases)):
+        row = [("name", tc_name)]
+        row += [
+            (n, cases[tc_name]["status"] if tc_name in cases else "skipped")
+            for n, cases in zip(column_names, run_cases, strict=True)
+        ]
+        yield row
+
+
 def test_stream():
     test_runs = tr.get()[-10:]
 
+    test_suite_names = set()
     for tests in test_runs:
         for ts in tests["test_suites"]:
             ts["test_cases"] = {t["name"]: t for t in ts["test_cases"]}
         tests["test_suites"] = {t["name"]: t for t in tests["test_suites"]}
+        test_suite_names.update(tests["test_suites"])
 
-    test_suite_names = sorted(
-        set(sum([list(t["test_suites"].keys()) for t in test_runs], []))
-    )
     test_suites = []
     column_names = [str(i) for i in range(len(test_runs))]
-    for ts_name in test_suite_names:
-        test_cases = []
-        test_case_names = sorted(
-            set(
-                sum(
-                    [
-                        list(t["test_suites"][ts_name]["test_cases"].keys())
-                        for t in test_runs
-                        if ts_name in t["test_suites"]
-                    ],
-                    [],
-                )
-            )
+    for ts_name in sorted(test_suite_names):
+        # the test cases of this suite in each run (empty if the suite was not in the run),
+        # used both for the test case names and for the status rows
+        run_cases = [
+            t["test_suites"][ts_name]["test_cases"]
+            if ts_name in t["test_suites"]
+            else {}
+            for t in test_runs
+        ]
+        test_suites.append(
+            {"name": ts_name, "test_cases": _test_case_rows(column_names, run_cases)}
         )
-        for tc_name in test_case_names:
-            row = [("name", tc_name)]
-            row += [
-                (
-                    n,
-                    (
-                        t["test_suites"][ts_name]["test_cases"][tc_name]["status"]
-                        if ts_name in t["test_suites"]
-                        and tc_name in t["test_suites"][ts_name]["test_cases"]
-                        else "skipped"
-                    ),
-                )
-                for n, t in zip(column_names, test_runs, strict=True)
-            ]
-            test_cases.append(row)
-        test_suites.append({"name": ts_name, "test_cases": test_cases})
     data = {"columns": column_names, "test_suites": test_suites}
 
     template = get_template("test-stream.html")
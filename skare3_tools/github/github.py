@@ -93,7 +93,9 @@ try:
 except ModuleNotFoundError:
     keyring = None
 
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from urllib3.util import Retry
 
 
 class AuthException(Exception):
@@ -154,6 +156,19 @@ class GithubAPI:
         self.auth = None
         self.headers = None
         self.api_url = "https://api.github.com"
+        # a session keeps connections alive, so consecutive calls do not reconnect each time
+        self.session = requests.Session()
+        # rate-limited and transient server errors are retried with exponential backoff,
+        # honoring Retry-After. Only idempotent methods are retried (urllib3's default),
+        # and connection errors only twice, so being offline still fails quickly.
+        retry = Retry(
+            total=5,
+            connect=2,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            raise_on_status=False,
+        )
+        self.session.mount("https://", HTTPAdapter(max_retries=retry))
 
         try:
             self.init(user, password, token)
@@ -282,7 +297,7 @@ class GithubAPI:
             params,
             kwargs,
         )
-        r = requests.request(
+        r = self.session.request(
             method, url, headers=_headers, auth=self.auth, params=params, **kwargs
         )
         if check:
@@ -379,6 +394,8 @@ class _EndpointGroup:
         """
         if "params" not in kwargs:
             kwargs["params"] = {}
+        # request the largest page Github allows (the default is 30 items per page)
+        kwargs["params"].setdefault("per_page", 100)
         page = 1
         count = 0
         while True:
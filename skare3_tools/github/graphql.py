@@ -362,6 +362,8 @@ class GithubAPI:
         self.initialized = False
         self.headers = None
         self.api_url = "https://api.github.com/graphql"
+        # a session keeps connections alive, so consecutive calls do not reconnect each time
+        self.session = requests.Session()
         try:
             self.init(token)
         except AuthException:
@@ -438,7 +440,7 @@ class GithubAPI:
 
         _headers = self.headers.copy()
         _headers.update(headers)
-        response = requests.request(
+        response = self.session.request(
             "post", self.api_url, headers=_headers, json={"query": query}, **kwargs
         )
 
@@ -86,8 +86,7 @@ import requests
 import yaml
 from packaging.version import InvalidVersion, Version
 
-from skare3_tools import github
-from skare3_tools.config import CONFIG
+from skare3_tools import config, github
 
 
 class NetworkException(Exception):
@@ -133,7 +132,10 @@ def json_cache(name, directory="", ignore=None, expires=None, update_policy=None
     import inspect
     from functools import wraps
 
-    directory = os.path.normpath(os.path.join(CONFIG["data_dir"], directory))
+    def cache_dir():
+        # not evaluated at decoration time, so importing this module does not load the config
+        return os.path.normpath(os.path.join(config.CONFIG["data_dir"], directory))
+
     if not ignore:
         ignore = []
     if expires:
@@ -156,7 +158,7 @@ def json_cache(name, directory="", ignore=None, expires=None, update_policy=None
             filename = "{name}{arg_str}.json".format(name=name, arg_str=arg_str)
             # in an ideal world, filename would be completely sanitized... this world is not ideal.
             filename = filename.replace(os.sep, "-")
-            filename = os.path.join(directory, filename)
+            filename = os.path.join(cache_dir(), filename)
             if expiration is not None and os.path.exists(filename):
                 m_time = datetime.datetime.fromtimestamp(os.path.getmtime(filename))
                 update = update or (datetime.datetime.now() - m_time > expiration)
@@ -182,7 +184,7 @@ def json_cache(name, directory="", ignore=None, expires=None, update_policy=None
             return result
 
         def clear_cache():
-            files = os.path.join(directory, "{name}*.json".format(name=name))
+            files = os.path.join(cache_dir(), "{name}*.json".format(name=name))
             files = glob.glob(files)
             if files:
                 subprocess.run(["rm"] + files, check=False)
@@ -201,7 +203,7 @@ def json_cache(name, directory="", ignore=None, expires=None, update_policy=None
                 ]
             )
             filename = os.path.join(
-                directory, "{name}{arg_str}.json".format(name=name, arg_str=arg_str)
+                cache_dir(), "{name}{arg_str}.json".format(name=name, arg_str=arg_str)
             )
             if os.path.exists(filename):
                 os.remove(filename)
@@ -213,14 +215,14 @@ def json_cache(name, directory="", ignore=None, expires=None, update_policy=None
 
 
 def _ensure_skare3_local_repo(update=True):
-    repo_dir = os.path.join(CONFIG["data_dir"], "skare3")
+    repo_dir = os.path.join(config.CONFIG["data_dir"], "skare3")
     parent = os.path.dirname(repo_dir)
     if not os.path.exists(parent):
         os.makedirs(parent)
     if not os.path.exists(repo_dir):
         _ = subprocess.run(
             ["git", "clone", "https://github.com/sot/skare3", repo_dir],
-            cwd=CONFIG["data_dir"],
+            cwd=config.CONFIG["data_dir"],
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             check=False,
@@ -236,18 +238,26 @@ def _ensure_skare3_local_repo(update=True):
     assert os.path.exists(repo_dir)
 
 
+# conda-build's jinja functions used in meta.yaml files, defined as no-ops
+_META_YAML_MACROS = (
+    "{% macro compiler(arg) %}{% endmacro %}\n"
+    "{% macro pin_compatible(arg) %}{% endmacro %}\n"
+)
+_META_YAML_ENV = jinja2.Environment()
+
+
 def _conda_package_list(update=True):
     _ensure_skare3_local_repo(update)
     all_meta = glob.glob(
-        os.path.join(CONFIG["data_dir"], "skare3", "pkg_defs", "*", "meta.yaml")
+        os.path.join(config.CONFIG["data_dir"], "skare3", "pkg_defs", "*", "meta.yaml")
     )
     all_info = []
     for f in all_meta:
-        macro = "{% macro compiler(arg) %}{% endmacro %}\n"
-        macro += "{% macro pin_compatible(arg) %}{% endmacro %}\n"
         try:
+            with open(f) as fh:
+                text = _META_YAML_MACROS + fh.read()
             info = yaml.load(
-                jinja2.Template(macro + open(f).read()).render(environ={}),
+                _META_YAML_ENV.from_string(text).render(environ={}),
                 Loader=yaml.FullLoader,
             )
         except jinja2.TemplateError as err:
@@ -295,7 +305,7 @@ def get_package_list():
     """
     all_packages = _conda_package_list()
     full_names = [p["repository"] for p in all_packages]
-    organizations = [github.Organization(org) for org in CONFIG["organizations"]]
+    organizations = [github.Organization(org) for org in config.CONFIG["organizations"]]
     repositories = [r for org in organizations for r in org.repositories()]
     for r in repositories:
         if r["full_name"] in full_names:
@@ -756,11 +766,11 @@ def get_conda_pkg_info(conda_package, conda_channel=None):
         kwargs = {"stdout": subprocess.PIPE}
     cmd = ["conda", "search", conda_package, "--override-channels", "--json"]
     if conda_channel is None:
-        conda_channels = CONFIG["conda_channels"]["main"]
+        conda_channels = config.CONFIG["conda_channels"]["main"]
     elif isinstance(conda_channel, list):
         conda_channels = conda_channel
-    elif conda_channel in CONFIG["conda_channels"]:
-        conda_channels = CONFIG["conda_channels"][conda_channel]
+    elif conda_channel in config.CONFIG["conda_channels"]:
+        conda_channels = config.CONFIG["conda_channels"][conda_channel]
     else:
         conda_channels = [conda_channel]
     unreachable = []
@@ -1063,7 +1073,7 @@ def repository_info_is_outdated(_, pkg_info):
     :return:
     """
     update = os.environ.get("SKARE3_REPO_INFO_LATEST", "").lower() in ["true", "1"]
-    if not dir_access_ok(CONFIG["data_dir"]) and not update:
+    if not dir_access_ok(config.CONFIG["data_dir"]) and not update:
         return False
     result = github.GITHUB_API_V4(_LAST_UPDATED_QUERY.render(**pkg_info))
     result = result["data"]["repository"]
@@ -1131,7 +1141,7 @@ def get_repositories_info(repositories=None, version="v4", update=False):
         repositories = [
             p["repository"]
             for p in get_package_list()
-            if p["owner"] in CONFIG["organizations"]
+            if p["owner"] in config.CONFIG["organizations"]
         ]
     repo_package_map = {
         p["repository"]: p["package"] for p in get_package_list() if p["repository"]
@@ -15,6 +15,8 @@ It seems that unknown arguments must be consecutive, and known arguments must be
 """
 
 import argparse
+import contextlib
+import functools
 import os
 import pathlib
 import re
@@ -22,6 +24,133 @@ import subprocess
 import sys
 import tempfile
 
+# these are applied to the whole meta.yaml text, so they must not match across lines
+VERSION_RE = re.compile(r"version[ \t]*:[ \t]*(?P<version>\S+)")
+DEPENDENCY_RE = re.compile(r"(?P<name>\S+)[ \t]*==[ \t]*(?P<version>\S+)")
+SKA3_NAME_RE = re.compile(r"ska3-\S+$")
+
+SKARE3_URL = "https://github.com/sot/skare3.git"
+
+# these are packages whose name does not match the repository name
+# at this point, automated builds do not know the package name,
+# just the repository name, and the package name determines where to
+# get the configuration.
+PACKAGE_MAP = {
+    "cmd_states": "Chandra.cmd_states",
+    "eng_archive": "Ska.engarchive",
+}
+
+ARCHS = ["linux-64", "osx-64", "osx-arm64", "noarch", "win-64"]
+
+
+def scan_dir(directory):
+    """
+    List the entries in `directory`, including hidden ones (what `directory.glob("*")` yields).
+
+    :param directory: pathlib.Path
+    :return: list of os.DirEntry
+    """
+    with os.scandir(directory) as entries:
+        return list(entries)
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_package(name):
+    """
+    Return the skare3 package name corresponding to repository `name`.
+
+    :param name: str
+    :return: str
+    """
+    return PACKAGE_MAP.get(name, name)
+
+
+def git(*args):
+    """
+    Run a git command quietly and without ever prompting for credentials on the terminal.
+
+    Raises subprocess.CalledProcessError if the command fails.
+
+    :param args: str
+        git command and arguments
+    :return: subprocess.CompletedProcess
+    """
+    return subprocess.run(
+        ["git", "-c", "advice.detachedHead=false", *args],
+        env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+        stdout=subprocess.DEVNULL,
+        check=True,
+    )
+
+
+@contextlib.contextmanager
+def skare3_clone(branch, tmp_dir):
+    """
+    Context manager that clones `branch` of skare3 in a temporary directory inside `tmp_dir`.
+
+    Only the tip of the branch is cloned. The options used are supported by git 1.8, which is the
+    version in the centos7 builder image. The clone is removed on exit.
+
+    :param branch: str
+    :param tmp_dir: pathlib.Path
+    :return: pathlib.Path
+    """
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as clone_dir:
+        skare3_path = pathlib.Path(clone_dir).resolve() / "skare3"
+        git(
+            "clone",
+            "-q",
+            "--depth",
+            "1",
+            "--single-branch",
+            "--branch",
+            branch,
+            SKARE3_URL,
+            str(skare3_path),
+        )
+        yield skare3_path
+
+
+def _move_arch(arch, skare3_path, build_dir):
+    """
+    Move the conda packages built for `arch` from skare3's build directory into `build_dir`.
+
+    Any json file in the destination directory is removed.
+
+    :param arch: str
+    :param skare3_path: pathlib.Path
+    :param build_dir: pathlib.Path
+    :return: list of str
+        the paths of the package files (*.tar.bz2 and *.conda) that were moved
+    """
+    print(arch)
+    d_from = skare3_path / "builds" / arch
+    d_to = build_dir / arch
+    d_to.mkdir(exist_ok=True)
+    # I do this to make sure the directory is not empty
+    with open(d_to / ".ensure-non-empty-dir", "w"):
+        pass
+    files = []
+    if d_from.exists():
+        print(f"SKARE3 moving {d_from} -> {d_to}")
+        # d_from also holds conda-build's index files, so the directory itself is not moved
+        for entry in scan_dir(d_from):
+            if entry.name.endswith((".bz2", ".conda")):
+                filename = os.path.join(d_to, entry.name)
+                os.replace(entry.path, filename)
+                files.append(filename)
+    removed = set()
+    for entry in scan_dir(d_to):
+        if "json" in entry.name:
+            os.unlink(entry.path)
+            removed.add(entry.path)
+    # index files like repodata.json.bz2 are moved too, but they are removed above
+    return [
+        filename
+        for filename in files
+        if filename.endswith((".tar.bz2", ".conda")) and filename not in removed
+    ]
+
 
 def overwrite_skare3_version(current_version, new_version, pkg_path):
     """
@@ -29,7 +158,7 @@ def overwrite_skare3_version(current_version, new_version, pkg_path):
 
     This is not a general replacement. The version is replaced if:
 
-      - the line matches the pattern "  version: <current_version>"
+      - the line matches the pattern "  version: <current_version>" (only the first such line)
       - the line matches the pattern "  <pkg_name> ==<current_version>"
 
     with possible whitespace before/after, or whitespace around the colon or equality operator.
@@ -43,32 +172,27 @@ def overwrite_skare3_version(current_version, new_version, pkg_path):
     :return:
     """
     meta_file = pkg_path / "meta.yaml"
-    with open(meta_file) as fh:
-        lines = fh.readlines()
-    for i, line in enumerate(lines):
-        m = re.search(r"(\s+)?version(\s+)?:(\s+)?(?P<version>(\S+)+)", line)
-        if m:
-            version = m.groupdict()["version"]
-            version = version.strip('"').strip("'")
-            print("comparing {version} and {current_version}")
-            if version == str(current_version):
-                print(f"    - version: {current_version} -> {new_version}")
-                lines[i] = line.replace(current_version, new_version)
-        m = re.search(r"(\s+)?(?P<name>\S+)(\s+)?==(\s+)?(?P<version>(\S+)+)", line)
-        if m:
-            info = m.groupdict()
-            if (
-                re.match(r"ska3-\S+$", info["name"])
-                and info["version"] == current_version
-            ):
-                print(
-                    f'    - {info["name"]} dependency: {current_version} -> {new_version}'
-                )
-                lines[i] = line.replace(current_version, new_version)
+    text = meta_file.read_text()
+
+    def replace_version(match):
+        version = match["version"].strip('"').strip("'")
+        if version != str(current_version):
+            return match[0]
+        print(f"    - version: {current_version} -> {new_version}")
+        return match[0].replace(current_version, new_version)
 
-    with open(meta_file, "w") as f:
-        for line in lines:
-            f.write(line)
+    def replace_dependency(match):
+        if not (
+            SKA3_NAME_RE.match(match["name"]) and match["version"] == current_version
+        ):
+            return match[0]
+        print(f'    - {match["name"]} dependency: {current_version} -> {new_version}')
+        return match[0].replace(current_version, new_version)
+
+    # the package version is the first "version:" entry, no need to scan further
+    text = VERSION_RE.sub(replace_version, text, count=1)
+    text = DEPENDENCY_RE.sub(replace_dependency, text)
+    meta_file.write_text(text)
 
 
 """
@@ -99,6 +223,13 @@ def get_parser():
     parser.add_argument(
         "--skare3-branch", help="The branch to build (default: master", default="master"
     )
+    parser.add_argument(
+        "--jobs",
+        help="Number of parallel jobs used by each package build"
+        " (default: leave CPU_COUNT and MAKEFLAGS as they are)",
+        type=int,
+        default=None,
+    )
     return parser
 
 
@@ -142,18 +273,7 @@ def main():
     print("skare3 build args:", args)
     print("skare3 build unknown args:", unknown_args)
 
-    package = args.package.split("/")[-1]
-
-    # these are packages whose name does not match the repository name
-    # at this point, automated builds do not know the package name,
-    # just the repository name, and the package name determines where to
-    # get the configuration.
-    package_map = {
-        "cmd_states": "Chandra.cmd_states",
-        "eng_archive": "Ska.engarchive",
-    }
-    if package in package_map:
-        package = package_map[package]
+    package = resolve_package(args.package.split("/")[-1])
 
     print(f"Building {package}")
 
@@ -162,11 +282,11 @@ def main():
         condarc = pathlib.Path.home() / ".condarc"
         condarc_in = condarc.with_suffix(".in")
         condarc.replace(condarc_in)
-        with open(condarc_in) as condarc_in, open(condarc, "w") as condarc:
-            for line in condarc_in.readlines():
-                condarc.write(
-                    line.replace("${CONDA_PASSWORD}", os.environ["CONDA_PASSWORD"])
-                )
+        condarc.write_text(
+            condarc_in.read_text().replace(
+                "${CONDA_PASSWORD}", os.environ["CONDA_PASSWORD"]
+            )
+        )
     else:
         print(
             "Conda password needs to be given"
@@ -175,20 +295,10 @@ def main():
         sys.exit(100)
 
     tmp_dir = pathlib.Path("tmp")
-    if not tmp_dir.exists():
-        tmp_dir.mkdir()
-    with tempfile.TemporaryDirectory(dir=tmp_dir) as tmp_dir:
-        tmp_path = pathlib.Path(tmp_dir)
-        skare3_path = tmp_path / "skare3"
+    tmp_dir.mkdir(exist_ok=True)
+    with skare3_clone(args.skare3_branch, tmp_dir) as skare3_path:
         print(f"skare3_path: {skare3_path}")
 
-        # fetch skare3
-        subprocess.check_call(
-            ["git", "clone", "https://github.com/sot/skare3.git"],
-            cwd=skare3_path.parent,
-        )
-        subprocess.check_call(["git", "checkout", args.skare3_branch], cwd=skare3_path)
-
         # overwrite version
         if args.ska3_overwrite_version:
             skare3_old_version, skare3_new_version = args.ska3_overwrite_version.split(
@@ -210,49 +320,23 @@ def main():
             + [package]
         )
         print(" ".join(cmd))
-        subprocess.check_call(cmd, cwd=skare3_path)
+        # conda-build passes CPU_COUNT to build scripts, and make picks up MAKEFLAGS
+        env = os.environ.copy()
+        if args.jobs is not None:
+            env["CPU_COUNT"] = str(args.jobs)
+            env["MAKEFLAGS"] = f"{env.get('MAKEFLAGS', '')} -j{args.jobs}".strip()
+        subprocess.check_call(cmd, cwd=skare3_path, env=env)
         print("SKARE3 conda process finished")
 
         # move resulting files to work dir
         build_dir = pathlib.Path("builds")
-        if not build_dir.exists():
-            build_dir.mkdir()
-        for d in ["linux-64", "osx-64", "osx-arm64", "noarch", "win-64"]:
-            print(d)
-            d_from = skare3_path / "builds" / d
-            d_to = build_dir / d
-            if not d_to.exists():
-                d_to.mkdir()
-            # I do this to make sure the directory is not empty
-            with open(d_to / ".ensure-non-empty-dir", "w"):
-                pass
-            if d_from.exists():
-                print(f"SKARE3 moving {d_from} -> {d_to}")
-                for filename in d_from.glob("*.bz2"):
-                    filename2 = d_to / filename.name
-                    filename.replace(filename2)
-                for filename in d_from.glob("*.conda"):
-                    filename2 = d_to / filename.name
-                    filename.replace(filename2)
+        build_dir.mkdir(exist_ok=True)
+        files = []
+        for arch in ARCHS:
+            files += _move_arch(arch, skare3_path, build_dir)
         print("SKARE3 done")
-        for f in build_dir.glob("*/*json*"):
-            f.unlink()
 
         # report result
-        files = (
-            list(build_dir.glob("linux-64/*tar.bz2*"))
-            + list(build_dir.glob("osx-64/*tar.bz2*"))
-            + list(build_dir.glob("osx-arm64/*tar.bz2*"))
-            + list(build_dir.glob("noarch/*tar.bz2*"))
-            + list(build_dir.glob("win-64/*tar.bz2*"))
-        )
-        files += (
-            list(build_dir.glob("linux-64/*conda*"))
-            + list(build_dir.glob("osx-64/*conda*"))
-            + list(build_dir.glob("osx-arm64/*conda*"))
-            + list(build_dir.glob("noarch/*conda*"))
-            + list(build_dir.glob("win-64/*conda*"))
-        )
         files_str = " ".join([str(f) for f in files])
 
         print(f"Built files: {files_str}")
@@ -12,13 +12,14 @@ This script requires CONDA_PASSWORD to be defined.
 
 import argparse
 import collections
+import itertools
 import json
 import logging
 import os
 
 from packaging.version import Version
 
-from skare3_tools import github, packages
+from skare3_tools import config, github, packages
 
 
 class ArgumentException(Exception):
@@ -138,7 +139,9 @@ def repository_change_summary(
                             for r in p["release_info"]
                         }
                         merges = []
-                        for merge in sum([release_info[k] for k in releases], []):
+                        for merge in itertools.chain.from_iterable(
+                            release_info[k] for k in releases
+                        ):
                             pr = merge["pr_number"]
                             if merge["pr_number"]:
                                 url = f'{p["owner"]}/{p["name"]}/pull/{pr}'
@@ -407,7 +410,7 @@ def process_args(args):
     channel = sum(
         [
             ["-c", c.format(CONDA_PASSWORD=CONDA_PASSWORD)]
-            for c in packages.CONFIG["conda_channels"][args.conda_channel]
+            for c in config.CONFIG["conda_channels"][args.conda_channel]
         ],
         [],
     )
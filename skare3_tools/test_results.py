@@ -36,14 +36,38 @@ from pathlib import Path
 from cxotime import CxoTime
 from cxotime import units as u
 
-from skare3_tools.config import CONFIG
+from skare3_tools import config
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(data):
+    """
+    Parse JSON from a str or bytes, using orjson if it is available.
+
+    The files in the test result directory are written with the standard json module, which can
+    write NaN/Infinity and lone surrogate escapes. orjson rejects those, so in that case the
+    standard json module is used instead.
+
+    :param data: bytes or str
+    :return: the parsed object
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
 
 
 class TestResultException(Exception):
     pass
 
 
-SKARE3_TEST_DATA = Path(CONFIG["data_dir"]).absolute() / "test_logs"
+SKARE3_TEST_DATA = Path(config.CONFIG["data_dir"]).absolute() / "test_logs"
 INDEX_FILE = SKARE3_TEST_DATA / "index.json"
 
 if not SKARE3_TEST_DATA.exists():
@@ -59,8 +83,8 @@ LOGGER = logging.getLogger("skare3_tools")
 
 
 def remove(uid=None, directory=None, uids=(), directories=()):
-    with open(INDEX_FILE, "r") as fh:
-        test_result_index = json.load(fh)
+    with open(INDEX_FILE, "rb") as fh:
+        test_result_index = json_loads(fh.read())
 
     uids = list(uids)
     if uid and uid not in uids:
@@ -102,13 +126,13 @@ def remove(uid=None, directory=None, uids=(), directories=()):
 
 
 def remove_older_than(days):
-    with open(INDEX_FILE, "r") as fh:
-        test_result_index = json.load(fh)
+    with open(INDEX_FILE, "rb") as fh:
+        test_result_index = json_loads(fh.read())
 
     for tr in test_result_index:
         all_test_log = SKARE3_TEST_DATA / tr["destination"] / "all_tests.json"
-        with open(all_test_log) as fh:
-            test_suites = json.load(fh)
+        with open(all_test_log, "rb") as fh:
+            test_suites = json_loads(fh.read())
             date = CxoTime(test_suites["run_info"]["date"])
             rm = []
             if date < CxoTime() - days * u.day:
@@ -143,18 +167,22 @@ def add(directory, stream, tags=(), properties=None):
             )
         )
 
-    with open(all_test_log) as f:
-        uid = hashlib.md5(f.read().encode()).hexdigest()
+    # the file is read once, both to compute the uid and to parse it.
+    # The uid has always been computed on the text with universal newlines, so line endings are
+    # normalized the same way to keep uids unchanged.
+    with open(all_test_log, "rb") as f:
+        contents = f.read()
+    uid = hashlib.md5(
+        contents.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    ).hexdigest()
 
-    with open(INDEX_FILE, "r") as f:
-        test_result_index = json.load(f)
+    with open(INDEX_FILE, "rb") as f:
+        test_result_index = json_loads(f.read())
 
     if uid in [r["uid"] for r in test_result_index]:
         raise TestResultException("These test results already exist")
 
-    all_test_log = directory / "all_tests.json"
-    with open(all_test_log) as f:
-        test_suites = json.load(f)
+    test_suites = json_loads(contents)
 
     date = test_suites["run_info"]["date"]
     destination = "{stream}_{date}_{uid}".format(stream=stream, date=date, uid=uid)
@@ -252,8 +280,8 @@ def get(stream=None, architecture=None, tag=None, system=None):
     :param system: str
     :return: list
     """
-    with open(INDEX_FILE, "r") as f:
-        test_result_index = json.load(f)
+    with open(INDEX_FILE, "rb") as f:
+        test_result_index = json_loads(f.read())
 
     result = []
     for tr in test_result_index:
@@ -266,8 +294,8 @@ def get(stream=None, architecture=None, tag=None, system=None):
             continue
         directory = tr["destination"]
         all_test_log = SKARE3_TEST_DATA / directory / "all_tests.json"
-        with open(all_test_log) as f:
-            test_suites = json.load(f)
+        with open(all_test_log, "rb") as f:
+            test_suites = json_loads(f.read())
             if "run_info" not in test_suites:
                 test_suites["run_info"] = {}
             test_suites["run_info"] = {**tr, **test_suites["run_info"]}
@@ -294,8 +322,8 @@ def streams():
     """
     Get available streams.
     """
-    with open(INDEX_FILE, "r") as f:
-        test_result_index = json.load(f)
+    with open(INDEX_FILE, "rb") as f:
+        test_result_index = json_loads(f.read())
     return {tr["stream"] for tr in test_result_index}
 
 